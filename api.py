@@ -11,10 +11,11 @@ Endpoints:
 - POST /search/address - Search properties by address
 - GET /search/map/{county}/{map_number} - Search by map/property number
 - GET /search/map/{map_number} - Legacy endpoint (defaults to Fairfax)
+- POST /search/map/batch - Search many map/property numbers concurrently
 - GET /tax-summary - Get tax summary for a property
 
 Install dependencies:
-    pip install fastapi uvicorn requests beautifulsoup4
+    pip install fastapi uvicorn requests beautifulsoup4 lxml cachetools orjson
 
 Run the server:
     uvicorn api:app --reload
@@ -22,19 +23,33 @@ Run the server:
 
 from __future__ import annotations
 
-from decimal import Decimal
-from typing import Dict, List, Optional
+import asyncio
+import hashlib
+import logging
+import queue
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
 from urllib.parse import unquote
 
-from fastapi import FastAPI, HTTPException, Query
+from anyio import to_thread
+from cachetools import TTLCache
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from icare_address_search import (
     search_fairfax_address,
     search_fairfax_map_number,
+    format_map_number,
     fetch_fairfax_tax_summary,
     parse_currency,
     format_currency,
@@ -44,10 +59,132 @@ from travis_county_search import (
     fetch_travis_property_details,
 )
 
+logger = logging.getLogger(__name__)
+
+# Maximum number of keep-alive connections kept open per county host
+UPSTREAM_POOL_SIZE = 100
+
+# Maximum number of lookups one batch request runs at the same time
+BATCH_CONCURRENCY = 20
+
+# Maximum number of map numbers accepted in one batch request
+MAX_BATCH_SIZE = 100
+
+# County hosts contacted at startup so the first real lookup reuses a warm
+# (DNS-resolved, TLS-established) connection
+WARM_UP_URLS = (
+    "https://icare.fairfaxcounty.gov/",
+    "https://travis.go2gov.net/",
+)
+
+
+def create_http_adapter() -> HTTPAdapter:
+    """Build the keep-alive connection pool shared by every request handler."""
+    # County sites occasionally answer with transient gateway errors; the
+    # POSTs are read-only searches, so they are safe to retry as well.
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=UPSTREAM_POOL_SIZE,
+        max_retries=retry,
+    )
+    return adapter
+
+
+def create_http_session(adapter: HTTPAdapter) -> requests.Session:
+    """Build a session with its own cookie jar that sends requests through adapter.
+
+    The county sites keep each visitor's search results in a server-side
+    (cookie-bound) session, so lookups must not share cookies; they only
+    share the pooled connections.
+    """
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def start_log_listener() -> QueueListener:
+    """Send this module's log records through a queue written out by a background thread."""
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
+def stop_log_listener(listener: QueueListener) -> None:
+    """Flush queued log records and detach the queue handler."""
+    listener.stop()
+    for handler in list(logger.handlers):
+        if isinstance(handler, QueueHandler):
+            logger.removeHandler(handler)
+
+
+def _warm_up_connection(session: requests.Session, url: str) -> None:
+    """Open a pooled connection to url, ignoring any failure."""
+    try:
+        session.get(url, timeout=5)
+    except requests.RequestException as exc:
+        logger.info("Connection warm-up for %s failed: %s", url, exc)
+
+
+async def warm_up_connections(session: requests.Session) -> None:
+    """Pre-connect to every county host in the background."""
+    await asyncio.gather(
+        *[run_in_threadpool(_warm_up_connection, session, url) for url in WARM_UP_URLS]
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared upstream connection pool on startup and close it on shutdown."""
+    log_listener = start_log_listener()
+    # Scrapers block on upstream I/O in worker threads; allow one thread per
+    # pooled connection instead of the default 40.
+    to_thread.current_default_thread_limiter().total_tokens = UPSTREAM_POOL_SIZE
+    app.state.http_adapter = create_http_adapter()
+    # Don't hold up startup on slow county sites; warm connections in the background
+    warm_up = asyncio.create_task(
+        warm_up_connections(create_http_session(app.state.http_adapter))
+    )
+    yield
+    warm_up.cancel()
+    app.state.http_adapter.close()
+    stop_log_listener(log_listener)
+
+
+def get_http_adapter(request: Request) -> HTTPAdapter:
+    """Return the shared upstream connection pool created at startup."""
+    return request.app.state.http_adapter
+
+
+def get_http_session(adapter: HTTPAdapter = Depends(get_http_adapter)) -> requests.Session:
+    """Return a fresh upstream session for this request over the shared pool.
+
+    Not closed afterwards: Session.close() would also close the shared adapter.
+    """
+    return create_http_session(adapter)
+
+
 app = FastAPI(
     title="Multi-County Property Search API",
     description="API for searching properties and retrieving tax information from multiple counties",
     version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware to allow requests from web browsers
@@ -59,6 +196,9 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+# Compress larger payloads such as long tax-period histories
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 
 # County Configuration
 SUPPORTED_COUNTIES = {
@@ -92,6 +232,43 @@ SUPPORTED_COUNTIES = {
     }
 }
 
+# County lookups derived once from the static configuration above
+COUNTY_IDS = list(SUPPORTED_COUNTIES.keys())
+MAP_SEARCH_FEATURES = frozenset({"map_search", "parcel_search", "property_search"})
+MAP_SEARCH_COUNTIES = frozenset(
+    county_id
+    for county_id, info in SUPPORTED_COUNTIES.items()
+    if MAP_SEARCH_FEATURES.intersection(info.get("features", []))
+)
+
+# The /counties payload never changes within a deploy; encode it and its ETag once.
+# ETags are weak (W/) because GZipMiddleware may serve the same tag for both
+# the gzip and the identity encoding of a body.
+COUNTIES_BODY = orjson.dumps({
+    "success": True,
+    "count": len(SUPPORTED_COUNTIES),
+    "counties": list(SUPPORTED_COUNTIES.values())
+})
+COUNTIES_ETAG = f'W/"{hashlib.md5(COUNTIES_BODY).hexdigest()}"'
+
+# In-process caches of scraper output. County data changes at most daily,
+# so repeat lookups are served from memory instead of re-scraping.
+ADDRESS_SEARCH_TTL = 900
+MAP_SEARCH_TTL = 3600
+PROPERTY_DETAILS_TTL = 3600
+NOT_FOUND_TTL = 300
+
+ADDRESS_SEARCH_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=ADDRESS_SEARCH_TTL)
+MAP_SEARCH_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=MAP_SEARCH_TTL)
+PROPERTY_DETAILS_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=PROPERTY_DETAILS_TTL)
+# Map numbers that recently matched nothing; kept briefly so probes of bogus
+# numbers get an immediate 404
+NOT_FOUND_CACHE: TTLCache = TTLCache(maxsize=100_000, ttl=NOT_FOUND_TTL)
+
+# Scrapes currently running, so concurrent callers for the same key wait on
+# one upstream request instead of each firing their own.
+_INFLIGHT: Dict[Hashable, asyncio.Future] = {}
+
 
 # Request/Response Models
 class AddressSearchRequest(BaseModel):
@@ -103,8 +280,8 @@ class AddressSearchRequest(BaseModel):
     unit: str = Field(default="", description="Unit/Apartment number")
     page_size: str = Field(default="15", description="Number of results per page")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "number": "123",
                 "street": "MAIN",
@@ -113,6 +290,26 @@ class AddressSearchRequest(BaseModel):
                 "page_size": "15"
             }
         }
+    )
+
+
+class MapBatchRequest(BaseModel):
+    """Request model for batch map number search."""
+    county: str = Field(default="fairfax-va", description="County ID (e.g., 'fairfax-va', 'travis-tx')")
+    map_numbers: List[str] = Field(
+        ...,
+        max_length=MAX_BATCH_SIZE,
+        description=f"Map numbers / property IDs to look up (at most {MAX_BATCH_SIZE})",
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "county": "fairfax-va",
+                "map_numbers": ["0812030026", "1202010001"]
+            }
+        }
+    )
 
 
 class PropertyResult(BaseModel):
@@ -123,8 +320,7 @@ class PropertyResult(BaseModel):
     detail_url: Optional[str] = Field(None, alias="DetailURL")
     raw_data: Dict[str, str] = Field(default_factory=dict)
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class SearchResponse(BaseModel):
@@ -154,23 +350,91 @@ class TaxSummaryResponse(BaseModel):
     tax_year_code: str
 
 
-# Helper function to convert Decimal to float for JSON serialization
-def decimal_to_dict(data: Dict[str, object]) -> Dict:
-    """Convert Decimal objects to floats for JSON serialization."""
-    result = {}
-    for key, value in data.items():
-        if isinstance(value, Decimal):
-            result[key] = float(value)
-        elif isinstance(value, dict):
-            result[key] = decimal_to_dict(value)
-        elif isinstance(value, list):
-            result[key] = [
-                decimal_to_dict(item) if isinstance(item, dict) else item
-                for item in value
-            ]
-        else:
-            result[key] = value
-    return result
+async def _single_flight(key: Hashable, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+    """Await func(*args), sharing its result with concurrent callers for the same key."""
+    future = _INFLIGHT.get(key)
+    if future is not None:
+        return await asyncio.shield(future)
+
+    future = asyncio.get_running_loop().create_future()
+    _INFLIGHT[key] = future
+    try:
+        result = await func(*args)
+    except Exception as exc:
+        future.set_exception(exc)
+        # Mark the exception as retrieved in case nobody else was waiting
+        future.exception()
+        raise
+    except BaseException:
+        future.cancel()
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _INFLIGHT.pop(key, None)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_search_term(value: str) -> str:
+    """Upper-case a street name or suffix, reusing the result for repeat inputs."""
+    return value if value.isupper() else value.upper()
+
+
+def _build_tax_period(entry: Dict[str, object]) -> TaxPeriod:
+    """Convert one scraped tax period (or the total row) into a TaxPeriod."""
+    # The scraper already normalizes every field, so skip model validation
+    return TaxPeriod.model_construct(
+        year=entry.get("year", "Total"),
+        label=entry.get("label", ""),
+        amount_paid=entry.get("amount_paid_display", "$0.00"),
+        balance_due=entry.get("balance_due_display", "$0.00"),
+        amount_paid_decimal=float(entry.get("amount_paid", 0)),
+        balance_due_decimal=float(entry.get("balance_due", 0)),
+    )
+
+
+def _summary_to_response(summary: Dict[str, object]) -> TaxSummaryResponse:
+    """Convert fetch_fairfax_tax_summary output into the API response model."""
+    return TaxSummaryResponse.model_construct(
+        success=True,
+        title=summary.get("title", "Tax Summary"),
+        stub_number=summary.get("stub_number"),
+        periods=[_build_tax_period(period) for period in summary.get("periods", [])],
+        total=_build_tax_period(summary.get("total", {})),
+        tax_year_code=summary.get("tax_year_code", ""),
+    )
+
+
+def _compute_etag(body: bytes) -> str:
+    """Return a weak ETag for a response body (valid across content encodings)."""
+    return f'W/"{hashlib.md5(body).hexdigest()}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Return True if the client's If-None-Match header already covers etag.
+
+    Uses the weak comparison If-None-Match calls for: W/ prefixes are ignored.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates or "*" in candidates
+
+
+def _etag_response(request: Request, body: bytes, etag: Optional[str] = None) -> Response:
+    """Return body as JSON with an ETag, or an empty 304 if the client already has it."""
+    etag = etag or _compute_etag(body)
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+async def _scrape_tax_summary(session: requests.Session, detail_url: str) -> Dict[str, object]:
+    """Scrape the Fairfax tax summary at detail_url and shape it for JSON responses."""
+    scraped = await run_in_threadpool(fetch_fairfax_tax_summary, session, detail_url)
+    return _summary_to_response(scraped).model_dump(exclude={"success"})
 
 
 @app.get("/")
@@ -185,23 +449,23 @@ async def root():
             "search": "POST /search/address",
             "map_search": "GET /search/map/{county}/{map_number}",
             "map_search_legacy": "GET /search/map/{map_number} (defaults to fairfax-va)",
+            "map_search_batch": "POST /search/map/batch",
             "tax_summary": "GET /tax-summary",
         },
     }
 
 
 @app.get("/counties")
-async def get_counties():
+async def get_counties(request: Request):
     """Get list of supported counties."""
-    return {
-        "success": True,
-        "count": len(SUPPORTED_COUNTIES),
-        "counties": list(SUPPORTED_COUNTIES.values())
-    }
+    return _etag_response(request, COUNTIES_BODY, COUNTIES_ETAG)
 
 
 @app.post("/search/address", response_model=SearchResponse)
-async def search_address(request: AddressSearchRequest):
+async def search_address(
+    request: AddressSearchRequest,
+    session: requests.Session = Depends(get_http_session),
+):
     """
     Search for properties by address.
 
@@ -215,7 +479,7 @@ async def search_address(request: AddressSearchRequest):
     if request.county not in SUPPORTED_COUNTIES:
         raise HTTPException(
             status_code=400,
-            detail=f"County '{request.county}' not supported. Available: {list(SUPPORTED_COUNTIES.keys())}"
+            detail=f"County '{request.county}' not supported. Available: {COUNTY_IDS}"
         )
 
     county_info = SUPPORTED_COUNTIES[request.county]
@@ -227,19 +491,24 @@ async def search_address(request: AddressSearchRequest):
             detail=f"{county_info['name']} search is coming soon"
         )
 
-    session = requests.Session()
-
     try:
         # Route to appropriate county scraper
         if request.county == "fairfax-va":
-            results, _ = search_fairfax_address(
-                number=request.number,
-                street=request.street.upper(),
-                suffix=request.suffix.upper(),
-                unit=request.unit,
-                page_size=request.page_size,
-                session=session,
-            )
+            street = _normalize_search_term(request.street)
+            suffix = _normalize_search_term(request.suffix) if request.suffix else ""
+            cache_key = (request.county, request.number, street, suffix, request.unit, request.page_size)
+            results = ADDRESS_SEARCH_CACHE.get(cache_key)
+            if results is None:
+                results, _ = await run_in_threadpool(
+                    search_fairfax_address,
+                    number=request.number,
+                    street=street,
+                    suffix=suffix,
+                    unit=request.unit,
+                    page_size=request.page_size,
+                    session=session,
+                )
+                ADDRESS_SEARCH_CACHE[cache_key] = results
         else:
             raise HTTPException(
                 status_code=501,
@@ -264,22 +533,159 @@ async def search_address(request: AddressSearchRequest):
         )
 
 
-@app.get("/search/map/{county}/{map_number}")
-async def search_by_map_number(county: str, map_number: str):
-    """
-    Search for a property by map number and return property details with tax information.
+async def _search_property(
+    county: str,
+    map_number: str,
+    session: requests.Session,
+) -> List[Dict[str, str]]:
+    """Run the county map/property-number search."""
+    county_info = SUPPORTED_COUNTIES[county]
 
-    Supports multiple counties. Map number format varies by county:
-    - Fairfax County, VA: "0812030026" or "0812 03 0026"
-    - Mecklenburg County, NC: Parcel ID format (coming soon)
+    # Route to appropriate county scraper
+    if county == "fairfax-va":
+        # search_fairfax_map_number normalizes "0812030026" and "0812 03 0026"
+        # to the same "0812 03  0026" query, so one search covers both formats
+        logger.info("Searching for map number: %s", map_number)
+        results, _ = await run_in_threadpool(
+            search_fairfax_map_number, map_number=map_number, session=session
+        )
+        logger.info("Search returned %d results", len(results))
+    elif county == "travis-tx":
+        # Travis County uses property ID search
+        logger.info("Searching Travis County for property ID: %s", map_number)
+        # A failed request must not look like "no match": that would be
+        # remembered in NOT_FOUND_CACHE
+        results, _ = await run_in_threadpool(
+            search_travis_property,
+            property_id=map_number,
+            session=session,
+            raise_errors=True,
+        )
+        logger.info("Search returned %d results", len(results))
+    else:
+        raise HTTPException(
+            status_code=501,
+            detail=f"{county_info['name']} search not yet implemented"
+        )
 
-    Returns both the property details and tax summary in one call.
+    return results
+
+
+def _map_number_not_found(map_number: str) -> HTTPException:
+    """Build the 404 returned when no property matches a map number."""
+    # Provide more detailed error message
+    error_msg = (
+        f"No property found with map number: {map_number}. "
+        f"Please verify the map number is correct. "
+        f"Expected format for Fairfax County: 10 digits (e.g., 0812030026). "
+        f"The system will automatically format it with spaces."
+    )
+    return HTTPException(
+        status_code=404,
+        detail=error_msg
+    )
+
+
+async def _scrape_map_lookup(
+    county: str,
+    map_number: str,
+    session: requests.Session,
+    cache_key: Tuple[str, str],
+) -> Dict[str, object]:
+    """Search for map_number and fetch its details on the same session.
+
+    Complete responses are stored in MAP_SEARCH_CACHE; ones where the tax
+    summary or county details couldn't be fetched are not.
     """
+    county_info = SUPPORTED_COUNTIES[county]
+
+    results = await _search_property(county, map_number, session)
+    if not results:
+        NOT_FOUND_CACHE[cache_key] = True
+        raise _map_number_not_found(map_number)
+
+    # Get the first result (should be exact match)
+    property_data = results[0]
+    detail_url = property_data.get("DetailURL")
+
+    if not detail_url:
+        response = {
+            "success": True,
+            "property": property_data,
+            "tax_summary": None,
+            "message": "Property found but no detail URL available"
+        }
+        MAP_SEARCH_CACHE[cache_key] = response
+        return response
+
+    # Fetch additional details based on county
+    try:
+        if county == "fairfax-va":
+            # Fetch Fairfax County tax summary; it is cached as part of the
+            # whole response, never on its own by the session-relative detail_url
+            tax_summary = await _scrape_tax_summary(session, detail_url)
+
+            response = {
+                "success": True,
+                "property": property_data,
+                "tax_summary": tax_summary,
+            }
+        elif county == "travis-tx":
+            # For Travis County, fetch property details
+            property_details = PROPERTY_DETAILS_CACHE.get(detail_url)
+            if property_details is None:
+                property_details = await run_in_threadpool(
+                    fetch_travis_property_details, detail_url, session
+                )
+                # The scraper returns {} on failure; don't cache that
+                if property_details:
+                    PROPERTY_DETAILS_CACHE[detail_url] = property_details
+
+            response = {
+                "success": True,
+                "property": property_data,
+                "property_details": property_details,
+                "message": "Travis County property details retrieved"
+            }
+            if not property_details:
+                return response
+        else:
+            # For other counties, just return the property data
+            response = {
+                "success": True,
+                "property": property_data,
+                "message": f"Property found in {county_info['name']}"
+            }
+
+    except (requests.RequestException, ValueError) as exc:
+        # Return property data even if tax summary fails
+        return {
+            "success": True,
+            "property": property_data,
+            "tax_summary": None,
+            "message": f"Property found but tax summary unavailable: {str(exc)}"
+        }
+
+    MAP_SEARCH_CACHE[cache_key] = response
+    return response
+
+
+def _map_search_key(county: str, map_number: str) -> str:
+    """Return the form of map_number that identifies the upstream search it triggers."""
+    if county == "fairfax-va":
+        # Exactly what search_fairfax_map_number posts: "0812030026" and
+        # "0812 03 0026" share a key, "0812030026A" and "0812 03  0026A" don't
+        return format_map_number(map_number)
+    return map_number.replace(" ", "").upper()
+
+
+def _validate_map_county(county: str) -> None:
+    """Raise the HTTP error for a county that can't be searched by map number."""
     # Validate county
     if county not in SUPPORTED_COUNTIES:
         raise HTTPException(
             status_code=400,
-            detail=f"County '{county}' not supported. Available: {list(SUPPORTED_COUNTIES.keys())}"
+            detail=f"County '{county}' not supported. Available: {COUNTY_IDS}"
         )
 
     county_info = SUPPORTED_COUNTIES[county]
@@ -292,146 +698,38 @@ async def search_by_map_number(county: str, map_number: str):
         )
 
     # Check if county has the appropriate search feature
-    valid_features = ["map_search", "parcel_search", "property_search"]
-    if not any(feature in county_info.get("features", []) for feature in valid_features):
+    if county not in MAP_SEARCH_COUNTIES:
         raise HTTPException(
             status_code=501,
             detail=f"{county_info['name']} does not support property/map/parcel search"
         )
 
-    session = requests.Session()
+
+async def _lookup_map_number(
+    county: str,
+    map_number: str,
+    session: requests.Session,
+) -> Dict[str, object]:
+    """Find a property by map number and attach its tax summary or county details."""
+    _validate_map_county(county)
 
     try:
-        # Route to appropriate county scraper
-        if county == "fairfax-va":
-            # Log the original map number
-            print(f"Searching for map number: {map_number}")
-            results, _ = search_fairfax_map_number(
-                map_number=map_number,
-                session=session,
-            )
-            print(f"Search returned {len(results)} results")
-        elif county == "travis-tx":
-            # Travis County uses property ID search
-            print(f"Searching Travis County for property ID: {map_number}")
-            results, _ = search_travis_property(
-                property_id=map_number,
-                session=session,
-            )
-            print(f"Search returned {len(results)} results")
-        else:
-            raise HTTPException(
-                status_code=501,
-                detail=f"{county_info['name']} search not yet implemented"
+        # The whole response is cached: a detail URL is only valid on the
+        # session whose search produced it, so it can't be replayed later.
+        cache_key = (county, _map_search_key(county, map_number))
+        response = MAP_SEARCH_CACHE.get(cache_key)
+        if response is None:
+            # Numbers that just came back empty are answered without re-scraping
+            if cache_key in NOT_FOUND_CACHE:
+                raise _map_number_not_found(map_number)
+
+            response = await _single_flight(
+                ("map",) + cache_key, _scrape_map_lookup, county, map_number, session, cache_key
             )
+        return response
 
-        if not results:
-            # Try different formatting if initial search fails
-            if county == "fairfax-va" and map_number.replace(" ", "").isdigit():
-                # Try with spaces if no spaces were provided
-                if " " not in map_number:
-                    map_clean = map_number.replace(" ", "")
-                    # Try 4-2-4 format for 10 digits
-                    if len(map_clean) == 10:
-                        map_formatted = f"{map_clean[0:4]} {map_clean[4:6]} {map_clean[6:10]}"
-                        print(f"Retrying with formatted map number: {map_formatted}")
-                        results, _ = search_fairfax_map_number(
-                            map_number=map_formatted,
-                            session=session,
-                        )
-                        print(f"Formatted search returned {len(results)} results")
-
-            if not results:
-                # Provide more detailed error message
-                error_msg = (
-                    f"No property found with map number: {map_number}. "
-                    f"Please verify the map number is correct. "
-                    f"Expected format for Fairfax County: 10 digits (e.g., 0812030026). "
-                    f"The system will automatically format it with spaces."
-                )
-                raise HTTPException(
-                    status_code=404,
-                    detail=error_msg
-                )
-
-        # Get the first result (should be exact match)
-        property_data = results[0]
-        detail_url = property_data.get("DetailURL")
-
-        if not detail_url:
-            return {
-                "success": True,
-                "property": property_data,
-                "tax_summary": None,
-                "message": "Property found but no detail URL available"
-            }
-
-        # Fetch additional details based on county
-        try:
-            if county == "fairfax-va":
-                # Fetch Fairfax County tax summary
-                tax_summary = fetch_fairfax_tax_summary(session, detail_url)
-
-                # Convert tax summary for JSON
-                periods = []
-                for period in tax_summary.get("periods", []):
-                    periods.append({
-                        "year": period["year"],
-                        "label": period["label"],
-                        "amount_paid": period["amount_paid_display"],
-                        "balance_due": period["balance_due_display"],
-                        "amount_paid_decimal": float(period["amount_paid"]),
-                        "balance_due_decimal": float(period["balance_due"]),
-                    })
-
-                total = tax_summary.get("total", {})
-                total_data = {
-                    "year": total.get("year", "Total"),
-                    "label": total.get("label", ""),
-                    "amount_paid": total.get("amount_paid_display", "$0.00"),
-                    "balance_due": total.get("balance_due_display", "$0.00"),
-                    "amount_paid_decimal": float(total.get("amount_paid", 0)),
-                    "balance_due_decimal": float(total.get("balance_due", 0)),
-                }
-
-                return {
-                    "success": True,
-                    "property": property_data,
-                    "tax_summary": {
-                        "title": tax_summary.get("title", "Tax Summary"),
-                        "stub_number": tax_summary.get("stub_number"),
-                        "tax_year_code": tax_summary.get("tax_year_code", ""),
-                        "periods": periods,
-                        "total": total_data,
-                    }
-                }
-            elif county == "travis-tx":
-                # For Travis County, fetch property details
-                property_details = fetch_travis_property_details(detail_url, session)
-
-                return {
-                    "success": True,
-                    "property": property_data,
-                    "property_details": property_details,
-                    "message": "Travis County property details retrieved"
-                }
-            else:
-                # For other counties, just return the property data
-                return {
-                    "success": True,
-                    "property": property_data,
-                    "message": f"Property found in {county_info['name']}"
-                }
-
-        except (requests.RequestException, ValueError) as exc:
-            # Return property data even if tax summary fails
-            return {
-                "success": True,
-                "property": property_data,
-                "tax_summary": None,
-                "message": f"Property found but tax summary unavailable: {str(exc)}"
-            }
-
+    except HTTPException:
+        raise
     except requests.RequestException as exc:
         raise HTTPException(
             status_code=500,
@@ -444,19 +742,90 @@ async def search_by_map_number(county: str, map_number: str):
         )
 
 
+@app.get("/search/map/{county}/{map_number}")
+async def search_by_map_number(
+    county: str,
+    map_number: str,
+    session: requests.Session = Depends(get_http_session),
+):
+    """
+    Search for a property by map number and return property details with tax information.
+
+    Supports multiple counties. Map number format varies by county:
+    - Fairfax County, VA: "0812030026" or "0812 03 0026"
+    - Mecklenburg County, NC: Parcel ID format (coming soon)
+
+    Returns both the property details and tax summary in one call.
+    """
+    # The lookup already returns plain JSON data; skip FastAPI's re-encoding pass
+    return ORJSONResponse(await _lookup_map_number(county, map_number, session))
+
+
 @app.get("/search/map/{map_number}")
-async def search_by_map_number_legacy(map_number: str):
+async def search_by_map_number_legacy(
+    map_number: str,
+    session: requests.Session = Depends(get_http_session),
+):
     """
     Legacy endpoint: Search by map number (defaults to Fairfax County, VA).
 
     For backward compatibility. New code should use /search/map/{county}/{map_number}
     """
-    return await search_by_map_number(county="fairfax-va", map_number=map_number)
+    return ORJSONResponse(await _lookup_map_number("fairfax-va", map_number, session))
+
+
+@app.post("/search/map/batch")
+async def search_by_map_number_batch(
+    request: MapBatchRequest,
+    adapter: HTTPAdapter = Depends(get_http_adapter),
+):
+    """
+    Search for many map numbers in one call.
+
+    Each map number is looked up exactly like /search/map/{county}/{map_number};
+    up to 20 lookups run concurrently over the shared connection pool. Failed
+    lookups are reported per item instead of failing the whole batch.
+    """
+    # An unsupported county fails the whole batch, not each item
+    _validate_map_county(request.county)
+
+    # Bound each batch's share of the connection pool so one large batch
+    # can't starve other requests
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def lookup(map_number: str) -> Dict[str, object]:
+        async with semaphore:
+            # Each item gets its own cookie jar so concurrent searches don't
+            # replace one another's server-side result list
+            session = create_http_session(adapter)
+            return await _lookup_map_number(request.county, map_number, session)
+
+    lookups = await asyncio.gather(
+        *[lookup(map_number) for map_number in request.map_numbers],
+        return_exceptions=True,
+    )
+
+    results = []
+    for map_number, outcome in zip(request.map_numbers, lookups):
+        if isinstance(outcome, HTTPException):
+            results.append({"success": False, "map_number": map_number, "error": outcome.detail})
+        elif isinstance(outcome, BaseException):
+            results.append({"success": False, "map_number": map_number, "error": str(outcome)})
+        else:
+            results.append({"map_number": map_number, **outcome})
+
+    return ORJSONResponse({
+        "success": True,
+        "count": len(results),
+        "results": results,
+    })
 
 
 @app.get("/tax-summary", response_model=TaxSummaryResponse)
 async def get_tax_summary(
-    detail_url: str = Query(..., description="The DetailURL from search results")
+    request: Request,
+    detail_url: str = Query(..., description="The DetailURL from search results"),
+    session: requests.Session = Depends(get_http_session),
 ):
     """
     Get tax summary for a specific property.
@@ -466,44 +835,17 @@ async def get_tax_summary(
     if not detail_url:
         raise HTTPException(status_code=400, detail="detail_url parameter is required")
 
-    # Decode the URL if it's encoded
-    detail_url = unquote(detail_url)
-
-    session = requests.Session()
+    # Decode the URL if it's still percent-encoded
+    if "%" in detail_url:
+        detail_url = unquote(detail_url)
 
     try:
-        summary = fetch_fairfax_tax_summary(session, detail_url)
-
-        # Convert the summary data for JSON serialization
-        periods = []
-        for period in summary.get("periods", []):
-            periods.append(TaxPeriod(
-                year=period["year"],
-                label=period["label"],
-                amount_paid=period["amount_paid_display"],
-                balance_due=period["balance_due_display"],
-                amount_paid_decimal=float(period["amount_paid"]),
-                balance_due_decimal=float(period["balance_due"]),
-            ))
-
-        total = summary.get("total", {})
-        total_period = TaxPeriod(
-            year=total.get("year", "Total"),
-            label=total.get("label", ""),
-            amount_paid=total.get("amount_paid_display", "$0.00"),
-            balance_due=total.get("balance_due_display", "$0.00"),
-            amount_paid_decimal=float(total.get("amount_paid", 0)),
-            balance_due_decimal=float(total.get("balance_due", 0)),
-        )
-
-        return TaxSummaryResponse(
-            success=True,
-            title=summary.get("title", "Tax Summary"),
-            stub_number=summary.get("stub_number"),
-            periods=periods,
-            total=total_period,
-            tax_year_code=summary.get("tax_year_code", ""),
-        )
+        # Not cached: detail_url only identifies a parcel within the session
+        # that ran the search
+        summary = await _scrape_tax_summary(session, detail_url)
+        # Already shaped like TaxSummaryResponse; skip re-validating it. The
+        # ETag lets clients revalidate the summary cheaply.
+        return _etag_response(request, orjson.dumps({"success": True, **summary}))
 
     except requests.RequestException as exc:
         raise HTTPException(
@@ -529,5 +871,17 @@ async def health_check():
 
 
 if __name__ == "__main__":
+    import os
+    import sys
+
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    # uvloop is not available on Windows; use the stdlib event loop there
+    uvicorn.run(
+        "api:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=(os.cpu_count() or 1) * 2 + 1,
+    )
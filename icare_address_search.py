@@ -6,64 +6,186 @@ workflow makes it easy to plug in more counties later. The script prompts
 for county selection, asks for the address, and prints tax summaries.
 
 Install dependencies first:
-    pip install requests beautifulsoup4
+    pip install requests beautifulsoup4 lxml
 """
 
 from __future__ import annotations
 
-from decimal import Decimal, InvalidOperation
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+import weakref
+from decimal import Decimal
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from lxml import etree
+from lxml import html as lxml_html
+
+from parse_utils import format_currency, parse_currency
 
 SEARCH_URL = "https://icare.fairfaxcounty.gov/ffxcare/search/CommonSearch.aspx?mode=ADDRESS"
 MAP_NUMBER_SEARCH_URL = "https://icare.fairfaxcounty.gov/ffxcare/search/CommonSearch.aspx?mode=PARID"
 
+_ZERO = Decimal("0")
+
+logger = logging.getLogger(__name__)
+
+
+def _create_adapter() -> HTTPAdapter:
+    """Build the keep-alive connection pool shared by this module's sessions."""
+    return HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.3),
+        # Wait for a pooled connection rather than opening throwaway ones
+        pool_block=True,
+    )
+
+
+_ADAPTER = _create_adapter()
+
 
-def collect_form_fields(html: str) -> Dict[str, str]:
+def create_session(adapter: HTTPAdapter | None = None) -> requests.Session:
+    """Build a session with its own cookie jar over a shared connection pool.
+
+    iCare keeps each visitor's search in a cookie-bound server session, so
+    concurrent searches need separate sessions; they can still share
+    adapter (the module's pool by default) and its TLS connections.
+    """
+    session = requests.Session()
+    # Advertise brotli/zstd too when their decoders are installed; the
+    # VIEWSTATE-heavy pages compress very well.
+    session.headers.update({"Accept-Encoding": ACCEPT_ENCODING, "Connection": "keep-alive"})
+    adapter = adapter or _ADAPTER
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Default session for callers that don't pass their own (CLI, debug scripts)
+DEFAULT_SESSION = create_session()
+
+# Landing-page form fields (__VIEWSTATE etc.) per session and search URL, so
+# back-to-back searches skip the GET. Entries go away with their session.
+_FORM_FIELD_CACHE: weakref.WeakKeyDictionary[requests.Session, Dict[str, Dict[str, str]]] = (
+    weakref.WeakKeyDictionary()
+)
+
+# The default session also keeps form fields on disk for an hour, so re-running
+# the CLI or the test_* debug scripts can skip the landing-page GET entirely
+FORM_CACHE_DIR = Path(__file__).resolve().parent / ".form_cache"
+FORM_CACHE_MAX_AGE = 3600  # seconds
+
+# Text ASP.NET renders when posted __VIEWSTATE/__EVENTVALIDATION are rejected
+_STALE_FORM_MARKERS = (
+    b"Validation of viewstate MAC failed",
+    b"The state information is invalid",
+    b"Invalid postback or callback argument",
+)
+
+# Messages iCare shows when a search matched nothing, for checking raw responses.
+# Inline scripts are cut out first: they contain strings like
+# alert("SortBy field not found") on every results page.
+_NO_RESULT_RE = re.compile(rb"(?i)no records|not found|No results found")
+_SCRIPT_BLOCK_RE = re.compile(rb"(?is)<script\b.*?</script\s*>")
+
+
+def _parse_html(html: str | bytes) -> lxml_html.HtmlElement:
+    """Parse a page with lxml.html, decoding raw bytes as UTF-8 (what iCare serves)."""
+    if isinstance(html, bytes):
+        # Parsers aren't thread-safe and are cheap to build, so make one per call
+        return lxml_html.fromstring(html, parser=lxml_html.HTMLParser(encoding="utf-8"))
+    return lxml_html.fromstring(html)
+
+
+def collect_form_fields(html: str | bytes) -> Dict[str, str]:
     """Return a mapping of all form input names to their values."""
-    soup = BeautifulSoup(html, "html.parser")
+    # Only name/value pairs are needed, so walk the lxml tree directly rather
+    # than building a BeautifulSoup tree over the (very large) __VIEWSTATE page.
+    root = _parse_html(html)
     fields: Dict[str, str] = {}
-    for tag in soup.select("input[name]"):
+    for tag in root.iter("input"):
         name = tag.get("name")
         if not name:
             continue
-        fields[name] = tag.get("value", "")
+        fields[name] = tag.get("value") or ""
     return fields
 
 
-def _extract_detail_url(tr: BeautifulSoup) -> Optional[str]:
+# Compiled once: the search-results grid is parsed on every address/map search
+_HEADER_CELLS_XPATH = etree.XPath(".//thead//tr//th")
+_BODY_ROWS_XPATH = etree.XPath(".//tbody//tr")
+_ROW_CELLS_XPATH = etree.XPath(".//td")
+_TEXT_NODES_XPATH = etree.XPath(".//text()[not(ancestor::script or ancestor::style)]")
+_ONCLICK_RE = re.compile(r"selectSearchRow\('(.*?)'\)", re.DOTALL)
+_MAP_RE = re.compile(r"(\d{4})(\d{2})(\d{4})")
+
+
+# Tax detail page lookups
+_TAX_STUB_CELLS_XPATH = etree.XPath(
+    "(//div[@name='TAX_STUB'])[1]//table[count(preceding-sibling::table) = 1]"
+    "//td[contains(concat(' ', normalize-space(@class), ' '), ' DataletData ')]"
+)
+_TAX_SUMMARY_DIV_XPATH = etree.XPath("(//div[@name='TAX_SUM'])[1]")
+_FIRST_TABLE_XPATH = etree.XPath("(.//table)[1]")
+_SUMMARY_TABLE_XPATH = etree.XPath("(.//table[starts-with(@id, 'Summary')])[1]")
+_TABLE_ROWS_XPATH = etree.XPath(".//tr")
+_TAX_YEAR_FIELD_XPATH = etree.XPath("(//*[@id='hdTaxYear'])[1]")
+
+
+def _element_text(element: etree._Element, separator: str = " ") -> str:
+    """Return the element's text like BeautifulSoup's get_text(separator, strip=True)."""
+    return separator.join(text for text in (t.strip() for t in _TEXT_NODES_XPATH(element)) if text)
+
+
+def _extract_detail_url(tr: etree._Element) -> Optional[str]:
     """Extract the detail URL embedded in the row's onclick handler."""
-    onclick = tr.get("onclick") or ""
-    marker = "selectSearchRow('"
-    if marker not in onclick:
-        return None
-    start = onclick.index(marker) + len(marker)
-    end = onclick.find("')", start)
-    if end == -1:
-        return None
-    relative = onclick[start:end]
-    return requests.compat.urljoin(SEARCH_URL, relative)
+    match = _ONCLICK_RE.search(tr.get("onclick") or "")
+    return urljoin(SEARCH_URL, match.group(1)) if match else None
+
 
+def _find_results_table(html: str | bytes) -> Optional[etree._Element]:
+    """Stream the page and return the results grid as soon as its </table> is parsed."""
+    source = io.BytesIO(html if isinstance(html, bytes) else html.encode("utf-8"))
+    fallback: Optional[etree._Element] = None
+    for _, table in etree.iterparse(source, events=("end",), tag="table", html=True, encoding="utf-8"):
+        # Everything after the grid (scripts, footer) is never parsed
+        if table.get("id") == "searchResults":
+            return table
+        if fallback is None and "rgMasterTable" in (table.get("class") or "").split():
+            fallback = table
+    return fallback
 
-def parse_results_table(html: str) -> List[Dict[str, str]]:
+
+def parse_results_table(html: str | bytes) -> List[Dict[str, str]]:
     """Parse the address results grid into a list of dictionaries."""
-    soup = BeautifulSoup(html, "html.parser")
-    table = soup.select_one("table#searchResults") or soup.select_one("table.rgMasterTable")
-    if not table:
+    if not html.strip():
+        return []
+    table = _find_results_table(html)
+    if table is None:
         return []
 
     headers: List[Optional[str]] = []
-    for th in table.select("thead tr th"):
-        text = th.get_text(" ", strip=True)
+    for th in _HEADER_CELLS_XPATH(table):
+        text = _element_text(th)
         text = text.replace("\u25b2", "").replace("\u25bc", "").strip()
         headers.append(text or None)
 
     rows: List[Dict[str, str]] = []
-    for tr in table.select("tbody tr"):
-        cells = [td.get_text(" ", strip=True) for td in tr.select("td")]
+    for tr in _BODY_ROWS_XPATH(table):
+        cells = [_element_text(td) for td in _ROW_CELLS_XPATH(tr)]
         if not cells:
             continue
         # Drop leading checkbox column if present.
@@ -82,6 +204,89 @@ def parse_results_table(html: str) -> List[Dict[str, str]]:
     return rows
 
 
+def _form_cache_path(url: str) -> Path:
+    return FORM_CACHE_DIR / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+
+def _load_form_cache(url: str) -> Optional[Dict[str, str]]:
+    """Return form fields saved by an earlier run, or None if missing or expired."""
+    path = _form_cache_path(url)
+    try:
+        if time.time() - path.stat().st_mtime > FORM_CACHE_MAX_AGE:
+            return None
+        with path.open("r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _persist_form_cache(url: str, fields: Dict[str, str]) -> None:
+    """Save form fields for later runs; failures only cost a GET next time."""
+    path = _form_cache_path(url)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        FORM_CACHE_DIR.mkdir(exist_ok=True)
+        with tmp_path.open("w", encoding="utf-8") as fh:
+            json.dump(fields, fh)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def get_form_fields(session: requests.Session, url: str, refresh: bool = False) -> Dict[str, str]:
+    """Return a copy of the landing page's form fields, fetching them only on a cache miss."""
+    per_session = _FORM_FIELD_CACHE.setdefault(session, {})
+    use_disk = session is DEFAULT_SESSION
+    fields = None if refresh else per_session.get(url)
+    if fields is None and use_disk and not refresh:
+        fields = _load_form_cache(url)
+    if fields is None:
+        initial = session.get(url, timeout=30)
+        initial.raise_for_status()
+        fields = collect_form_fields(initial.content)
+        if use_disk:
+            _persist_form_cache(url, fields)
+    per_session[url] = fields
+    return dict(fields)
+
+
+def find_no_result_message(content: bytes) -> Optional[str]:
+    """Return the "no results" message shown on a raw search page, if any."""
+    match = _NO_RESULT_RE.search(_SCRIPT_BLOCK_RE.sub(b"", content))
+    return match.group(0).decode() if match else None
+
+
+def _is_stale_form_response(response: requests.Response) -> bool:
+    """Return True if the server rejected the form state we posted.
+
+    Judged by ASP.NET's rejection text only: a 5xx on its own usually means
+    the site is struggling, and re-fetching the form would add to its load.
+    """
+    return any(marker in response.content for marker in _STALE_FORM_MARKERS)
+
+
+def post_search(
+    session: requests.Session,
+    url: str,
+    search_fields: Dict[str, str],
+    form_fields: Optional[Dict[str, str]] = None,
+) -> requests.Response:
+    """POST a search using cached form fields, refreshing them once if they've gone stale.
+
+    form_fields, if given, are used instead of the session's cached ones, so
+    fresh sessions can reuse fields another session already loaded.
+    """
+    payload = dict(form_fields) if form_fields is not None else get_form_fields(session, url)
+    payload.update(search_fields)
+    response = session.post(url, data=payload, timeout=30)
+    if _is_stale_form_response(response):
+        payload = get_form_fields(session, url, refresh=True)
+        payload.update(search_fields)
+        response = session.post(url, data=payload, timeout=30)
+    response.raise_for_status()
+    return response
+
+
 def search_fairfax_address(
     number: str,
     street: str,
@@ -89,15 +294,13 @@ def search_fairfax_address(
     unit: str = "",
     page_size: str = "15",
     session: requests.Session | None = None,
-) -> Tuple[List[Dict[str, str]], str]:
+) -> Tuple[List[Dict[str, str]], bytes]:
     """Perform an address search and return parsed rows plus the raw HTML."""
-    session = session or requests.Session()
-
-    initial = session.get(SEARCH_URL, timeout=30)
-    initial.raise_for_status()
+    session = session or DEFAULT_SESSION
 
-    payload = collect_form_fields(initial.text)
-    payload.update(
+    response = post_search(
+        session,
+        SEARCH_URL,
         {
             "inpNumber": number,
             "inpStreet": street,
@@ -107,111 +310,91 @@ def search_fairfax_address(
             "PageNum": "1",
             "PageSize": page_size,
             "selPageSize": page_size,
-        }
+        },
     )
+    return parse_results_table(response.content), response.content
 
-    response = session.post(SEARCH_URL, data=payload, timeout=30)
-    response.raise_for_status()
-    return parse_results_table(response.text), response.text
+
+def format_map_number(map_number: str) -> str:
+    """Return the inpParid value searched for map_number.
+
+    Exactly 10 digits (spaces ignored) become "XXXX XX  XXXX", with a double
+    space between the second and third groups; anything else is used as-is.
+    """
+    # Normalize map number - remove all spaces
+    match = _MAP_RE.fullmatch(map_number.replace(" ", ""))
+    if match:
+        return "{} {}  {}".format(*match.groups())  # Note the double space
+    # Use as-is if it doesn't match expected format
+    return map_number
 
 
 def search_fairfax_map_number(
     map_number: str,
     session: requests.Session | None = None,
-) -> Tuple[List[Dict[str, str]], str]:
+) -> Tuple[List[Dict[str, str]], bytes]:
     """Perform a map number search and return parsed rows plus the raw HTML.
 
     Map number format: "0812 03  0026" or "0812030026" (will be normalized to "0812 03  0026" with double space)
     """
-    session = session or requests.Session()
-
-    # Normalize map number - remove all spaces
-    map_clean = map_number.replace(" ", "")
-
-    # If we have exactly 10 digits, format it as: XXXX XX  XXXX (with double space between second and third group)
-    if len(map_clean) == 10 and map_clean.isdigit():
-        map_formatted = f"{map_clean[0:4]} {map_clean[4:6]}  {map_clean[6:10]}"  # Note the double space
-    else:
-        # Use as-is if it doesn't match expected format
-        map_formatted = map_number
-
-    print(f"[DEBUG] Map number input: '{map_number}'")
-    print(f"[DEBUG] Map number formatted: '{map_formatted}'")
+    session = session or DEFAULT_SESSION
+    map_formatted = format_map_number(map_number)
 
-    initial = session.get(MAP_NUMBER_SEARCH_URL, timeout=30)
-    initial.raise_for_status()
+    logger.debug("Map number input: '%s'", map_number)
+    logger.debug("Map number formatted: '%s'", map_formatted)
 
-    payload = collect_form_fields(initial.text)
-    payload.update(
+    logger.debug("Sending POST with inpParid: '%s'", map_formatted)
+    response = post_search(
+        session,
+        MAP_NUMBER_SEARCH_URL,
         {
             "inpParid": map_formatted,
             "hdAction": "Search",
             "PageNum": "1",
             "PageSize": "15",
             "selPageSize": "15",
-        }
+        },
     )
 
-    print(f"[DEBUG] Sending POST with inpParid: '{map_formatted}'")
-    response = session.post(MAP_NUMBER_SEARCH_URL, data=payload, timeout=30)
-    response.raise_for_status()
-
-    results, html = parse_results_table(response.text), response.text
-    print(f"[DEBUG] Found {len(results)} results")
+    results, html = parse_results_table(response.content), response.content
+    logger.debug("Found %d results", len(results))
 
     return results, html
 
 
-def parse_currency(value: str) -> Decimal:
-    """Convert Fairfax currency strings like '$.00' or '-$59,026.66' to Decimals."""
-    cleaned = value.replace("$", "").replace(",", "").strip()
-    if cleaned in {"", ".", ".00"}:
-        return Decimal("0")
-    if cleaned.startswith("-."):
-        cleaned = "-0" + cleaned[1:]
-    elif cleaned.startswith("."):
-        cleaned = "0" + cleaned
-    try:
-        return Decimal(cleaned)
-    except InvalidOperation as exc:
-        raise ValueError(f"Unable to parse currency value '{value}'") from exc
-
-
-def format_currency(amount: Decimal) -> str:
-    sign = "-" if amount < 0 else ""
-    return f"{sign}${abs(amount):,.2f}"
-
-
-def extract_fairfax_tax_summary(html: str) -> Dict[str, object]:
+def extract_fairfax_tax_summary(html: str | bytes) -> Dict[str, object]:
     """Return structured tax summary data from the Fairfax tax detail page."""
-    soup = BeautifulSoup(html, "html.parser")
+    if not html.strip():
+        raise ValueError("Tax summary section not found on the page.")
+    root = _parse_html(html)
 
     stub_number = None
-    stub_div = soup.select_one("div[name='TAX_STUB']")
-    if stub_div:
-        data_cells = stub_div.select("table:nth-of-type(2) td.DataletData")
-        if data_cells:
-            stub_number = data_cells[0].get_text(strip=True)
-
-    summary_div = soup.select_one("div[name='TAX_SUM']")
-    if not summary_div:
+    stub_cells = _TAX_STUB_CELLS_XPATH(root)
+    if stub_cells:
+        stub_number = _element_text(stub_cells[0], "")
+
+    summary_divs = _TAX_SUMMARY_DIV_XPATH(root)
+    if not summary_divs:
         raise ValueError("Tax summary section not found on the page.")
+    summary_div = summary_divs[0]
 
-    heading_table = summary_div.find("table")
-    title = heading_table.get_text(strip=True) if heading_table else "Tax Summary"
+    heading_tables = _FIRST_TABLE_XPATH(summary_div)
+    title = _element_text(heading_tables[0], "") if heading_tables else "Tax Summary"
 
-    data_table = summary_div.find("table", id=lambda v: v and v.startswith("Summary"))
-    if not data_table:
+    data_tables = _SUMMARY_TABLE_XPATH(summary_div)
+    if not data_tables:
         raise ValueError("Summary table not found inside tax section.")
 
-    header_cells = data_table.find("tr").find_all("td")
-    headers = [cell.get_text(strip=True) for cell in header_cells]
+    table_rows = _TABLE_ROWS_XPATH(data_tables[0])
+    if not table_rows:
+        raise ValueError("Summary table has no rows.")
+    headers = [_element_text(cell, "") for cell in _ROW_CELLS_XPATH(table_rows[0])]
 
     periods: List[Dict[str, object]] = []
     total_entry: Optional[Dict[str, object]] = None
 
-    for tr in data_table.find_all("tr")[1:]:
-        cells = [td.get_text(strip=True) for td in tr.find_all("td")]
+    for tr in table_rows[1:]:
+        cells = [_element_text(td, "") for td in _ROW_CELLS_XPATH(tr)]
         if len(cells) != len(headers):
             continue
         record = dict(zip(headers, cells))
@@ -231,8 +414,8 @@ def extract_fairfax_tax_summary(html: str) -> Dict[str, object]:
         total_entry = {
             "year": "Total",
             "label": "",
-            "amount_paid": Decimal("0"),
-            "balance_due": Decimal("0"),
+            "amount_paid": _ZERO,
+            "balance_due": _ZERO,
             "raw": {},
         }
 
@@ -241,9 +424,9 @@ def extract_fairfax_tax_summary(html: str) -> Dict[str, object]:
         entry["balance_due_display"] = format_currency(entry["balance_due"])
 
     tax_year_code = ""
-    tax_year_field = soup.select_one("#hdTaxYear")
-    if tax_year_field and tax_year_field.has_attr("value"):
-        tax_year_code = tax_year_field["value"]
+    tax_year_fields = _TAX_YEAR_FIELD_XPATH(root)
+    if tax_year_fields and tax_year_fields[0].get("value") is not None:
+        tax_year_code = tax_year_fields[0].get("value")
 
     return {
         "title": title,
@@ -254,12 +437,13 @@ def extract_fairfax_tax_summary(html: str) -> Dict[str, object]:
     }
 
 
-def fetch_fairfax_tax_summary(session: requests.Session, detail_url: str) -> Dict[str, object]:
+def fetch_fairfax_tax_summary(session: requests.Session | None, detail_url: str) -> Dict[str, object]:
     """Load the tax detail page for a property and return parsed summary data."""
+    session = session or DEFAULT_SESSION
     profile_resp = session.get(detail_url, timeout=30)
     profile_resp.raise_for_status()
 
-    soup = BeautifulSoup(profile_resp.text, "html.parser")
+    soup = BeautifulSoup(profile_resp.content, "lxml", from_encoding="utf-8")
     tax_link = soup.select_one("div#sidemenu a[href*='mode=tax_details']")
     if tax_link and tax_link.has_attr("href"):
         tax_href = tax_link["href"]
@@ -270,7 +454,7 @@ def fetch_fairfax_tax_summary(session: requests.Session, detail_url: str) -> Dic
 
     tax_resp = session.get(tax_url, timeout=30)
     tax_resp.raise_for_status()
-    return extract_fairfax_tax_summary(tax_resp.text)
+    return extract_fairfax_tax_summary(tax_resp.content)
 
 
 def prompt_choice(options: Dict[str, str]) -> str:
@@ -362,7 +546,7 @@ def display_tax_summary(property_row: Dict[str, str], summary: Dict[str, object]
 
 
 def run_fairfax_cli() -> None:
-    session = requests.Session()
+    session = DEFAULT_SESSION
 
     while True:
         number, street, suffix, unit = prompt_address()
@@ -424,4 +608,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="[%(levelname)s] %(message)s")
     main()
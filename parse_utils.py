@@ -0,0 +1,42 @@
+"""
+Currency parsing helpers shared by the county scrapers.
+
+They run once per cell of every tax table, so this module is kept free of
+third-party imports and fully annotated for mypyc. It works as plain Python
+too; to compile it in place:
+    pip install mypy
+    python setup.py build_ext --inplace
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+# Built once rather than on every call
+_CURRENCY_STRIP = str.maketrans("", "", "$,")
+_EMPTY_CURRENCY = frozenset({"", ".", ".00"})
+_ZERO = Decimal("0")
+
+
+# Tax tables repeat a handful of strings ("$.00", "$0.00"...); Decimals are
+# immutable, so cached results are safe to share.
+@lru_cache(maxsize=256)
+def parse_currency(value: str) -> Decimal:
+    """Convert Fairfax currency strings like '$.00' or '-$59,026.66' to Decimals."""
+    cleaned = value.translate(_CURRENCY_STRIP).strip()
+    if cleaned in _EMPTY_CURRENCY:
+        return _ZERO
+    if cleaned.startswith("-."):
+        cleaned = "-0" + cleaned[1:]
+    elif cleaned.startswith("."):
+        cleaned = "0" + cleaned
+    try:
+        return Decimal(cleaned)
+    except InvalidOperation as exc:
+        raise ValueError(f"Unable to parse currency value '{value}'") from exc
+
+
+def format_currency(amount: Decimal) -> str:
+    sign = "-" if amount < 0 else ""
+    return f"{sign}${abs(amount):,.2f}"
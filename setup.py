@@ -0,0 +1,18 @@
+"""
+Optional build script that compiles parse_utils.py into a C extension with mypyc.
+
+    pip install mypy
+    python setup.py build_ext --inplace
+
+The API and CLI import parse_utils either way; without this step the plain
+Python module is used.
+"""
+
+from mypyc.build import mypycify
+from setuptools import setup
+
+setup(
+    name="govtaxcheck-parse-utils",
+    py_modules=["parse_utils"],
+    ext_modules=mypycify(["parse_utils.py"]),
+)
@@ -1,9 +1,25 @@
 #!/usr/bin/env python3
 """Direct test of map number search on Fairfax website"""
 
-import requests
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
 from bs4 import BeautifulSoup
-from icare_address_search import MAP_NUMBER_SEARCH_URL, collect_form_fields
+from icare_address_search import DEFAULT_SESSION, create_session, find_no_result_message, MAP_NUMBER_SEARCH_URL, get_form_fields, post_search
+
+
+def _probe_format(form_fields, format_test):
+    """POST one map number format (on the loaded form fields) and return the response"""
+    # Each probe gets its own cookie jar (one iCare server session) over the
+    # shared connection pool, so probes neither queue behind nor overwrite
+    # one another's search
+    return post_search(create_session(), MAP_NUMBER_SEARCH_URL, {
+        "inpParid": format_test,
+        "hdAction": "Search",
+        "PageNum": "1",
+        "PageSize": "15",
+        "selPageSize": "15",
+    }, form_fields=form_fields)
 
 def test_map_formats(base_number):
     """Test different formats of a map number"""
@@ -15,38 +31,28 @@ def test_map_formats(base_number):
         f"{base_number[0:4]}{base_number[4:6]} {base_number[6:10]}",  # Space after 6: 120201 0001
     ]
 
-    session = requests.Session()
-
-    for format_test in formats_to_test:
-        print(f"\nTesting format: '{format_test}'")
+    # Load the form fields once (from disk if a recent run saved them) so
+    # every format below reuses them
+    form_fields = get_form_fields(DEFAULT_SESSION, MAP_NUMBER_SEARCH_URL)
 
-        # Get initial page
-        initial = session.get(MAP_NUMBER_SEARCH_URL, timeout=30)
-        initial.raise_for_status()
+    # Probe every format concurrently
+    with ThreadPoolExecutor(max_workers=len(formats_to_test)) as executor:
+        responses = list(executor.map(lambda f: _probe_format(form_fields, f), formats_to_test))
 
-        # Collect form fields
-        payload = collect_form_fields(initial.text)
-        payload.update({
-            "inpParid": format_test,
-            "hdAction": "Search",
-            "PageNum": "1",
-            "PageSize": "15",
-            "selPageSize": "15",
-        })
-
-        # Send search request
-        response = session.post(MAP_NUMBER_SEARCH_URL, data=payload, timeout=30)
-        response.raise_for_status()
+    for format_test, response in zip(formats_to_test, responses):
+        # Buffer each probe's report and write it in one call
+        output = [f"\nTesting format: '{format_test}'"]
+        found = False
 
         # Parse results
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = BeautifulSoup(response.text, "lxml")
 
         # Look for results
         table = soup.find("table", {"id": "searchResults"})
         if table:
             results = table.select("tbody tr.SearchResults")
             if results:
-                print(f"  ✓ Found {len(results)} result(s)!")
+                output.append(f"  ✓ Found {len(results)} result(s)!")
                 # Get first result details
                 first_result = results[0]
                 cells = first_result.find_all("td")
@@ -54,19 +60,24 @@ def test_map_formats(base_number):
                     owner = cells[0].get_text(strip=True)
                     address = cells[1].get_text(strip=True)
                     map_num = cells[4].get_text(strip=True) if len(cells) > 4 else "N/A"
-                    print(f"    Owner: {owner}")
-                    print(f"    Address: {address}")
-                    print(f"    Map #: {map_num}")
-                return format_test  # Return successful format
+                    output.append(f"    Owner: {owner}")
+                    output.append(f"    Address: {address}")
+                    output.append(f"    Map #: {map_num}")
+                found = True
             else:
-                print(f"  ✗ No results found")
+                output.append(f"  ✗ No results found")
         else:
-            print(f"  ✗ No results table in response")
+            output.append(f"  ✗ No results table in response")
+
+        if not found:
+            # Check for error messages with one scan of the raw page
+            error_message = find_no_result_message(response.content)
+            if error_message:
+                output.append(f"  Error message: {error_message}")
 
-        # Check for error messages
-        error_msgs = soup.find_all(text=lambda t: t and ("no records" in t.lower() or "not found" in t.lower()))
-        if error_msgs:
-            print(f"  Error message: {error_msgs[0].strip()}")
+        sys.stdout.write("\n".join(output) + "\n")
+        if found:
+            return format_test  # Return successful format
 
     return None
 
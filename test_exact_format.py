@@ -1,37 +1,35 @@
 #!/usr/bin/env python3
 """Test exact map number format from curl request"""
 
-import requests
-from bs4 import BeautifulSoup
-from icare_address_search import MAP_NUMBER_SEARCH_URL, collect_form_fields
-
-def test_exact_search(map_number, format_description):
-    """Test with exact format"""
-    session = requests.Session()
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
-    print(f"\nTesting: {format_description}")
-    print(f"Map number: '{map_number}'")
+from bs4 import BeautifulSoup
+from icare_address_search import DEFAULT_SESSION, create_session, find_no_result_message, MAP_NUMBER_SEARCH_URL, get_form_fields, post_search
 
-    # Get initial page
-    initial = session.get(MAP_NUMBER_SEARCH_URL, timeout=30)
-    initial.raise_for_status()
 
-    # Collect form fields
-    payload = collect_form_fields(initial.text)
-    payload.update({
+def _fetch_results(form_fields, map_number):
+    """Run the search POST for one map number and return the response"""
+    # A session of its own (one iCare server session) over the shared
+    # connection pool; the landing page is only re-fetched if the server
+    # rejects the form fields
+    response = post_search(create_session(), MAP_NUMBER_SEARCH_URL, {
         "inpParid": map_number,
         "hdAction": "Search",
         "PageNum": "1",
         "PageSize": "15",
         "selPageSize": "15",
-    })
+    }, form_fields=form_fields)
+    return response
 
-    # Send search request
-    response = session.post(MAP_NUMBER_SEARCH_URL, data=payload, timeout=30)
-    response.raise_for_status()
+def test_exact_search(map_number, format_description, response):
+    """Test with exact format"""
+    # Buffer the report and write it in one call
+    output = [f"\nTesting: {format_description}", f"Map number: '{map_number}'"]
+    found = False
 
     # Parse results
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = BeautifulSoup(response.text, "lxml")
 
     # Look for results table
     table = soup.find("table", {"id": "searchResults"})
@@ -41,7 +39,7 @@ def test_exact_search(map_number, format_description):
         results = [r for r in results if r.find("td")]
 
         if results:
-            print(f"✓ Found {len(results)} result(s)!")
+            output.append(f"✓ Found {len(results)} result(s)!")
             # Get first result details
             first_result = results[0]
             cells = first_result.find_all("td")
@@ -49,40 +47,61 @@ def test_exact_search(map_number, format_description):
                 owner = cells[0].get_text(strip=True)
                 address = cells[1].get_text(strip=True)
                 map_num = cells[4].get_text(strip=True) if len(cells) > 4 else "N/A"
-                print(f"  Owner: {owner}")
-                print(f"  Address: {address}")
-                print(f"  Map # (in results): '{map_num}'")
-            return True
+                output.append(f"  Owner: {owner}")
+                output.append(f"  Address: {address}")
+                output.append(f"  Map # (in results): '{map_num}'")
+            found = True
         else:
-            print("✗ No results found (empty table)")
+            output.append("✗ No results found (empty table)")
     else:
-        print("✗ No results table in response")
-
-    return False
+        output.append("✗ No results table in response")
+
+    if not found:
+        # One regex pass over the raw page for any error indicator
+        error_message = find_no_result_message(response.content)
+        if error_message:
+            output.append(f"Error indicator: {error_message}")
+
+    sys.stdout.write("\n".join(output) + "\n")
+    return found
+
+def run_cases(cases):
+    """Fetch every (map_number, description) case concurrently, then report them in order"""
+    # Load the form fields once (from disk if a recent run saved them) so
+    # the threads don't each fetch the landing page
+    form_fields = get_form_fields(DEFAULT_SESSION, MAP_NUMBER_SEARCH_URL)
+    with ThreadPoolExecutor(max_workers=len(cases)) as executor:
+        responses = list(executor.map(
+            lambda map_number: _fetch_results(form_fields, map_number),
+            [map_number for map_number, _ in cases],
+        ))
+    for (map_number, format_description), response in zip(cases, responses):
+        test_exact_search(map_number, format_description, response)
 
 # Test the working map number with different formats
 print("="*60)
 print("Testing WORKING map number: 0812030026")
 print("="*60)
 
-# From curl request - single spaces
-test_exact_search("0812 03 0026", "Single spaces (from curl)")
-
-# What we see in results - double space
-test_exact_search("0812 03  0026", "Double space (from HTML results)")
-
-# No spaces
-test_exact_search("0812030026", "No spaces")
+run_cases([
+    # From curl request - single spaces
+    ("0812 03 0026", "Single spaces (from curl)"),
+    # What we see in results - double space
+    ("0812 03  0026", "Double space (from HTML results)"),
+    # No spaces
+    ("0812030026", "No spaces"),
+])
 
 print("\n" + "="*60)
 print("Testing PROBLEMATIC map number: 1202010001")
 print("="*60)
 
 # Try different formats for the problematic number
-test_exact_search("1202 01 0001", "Single spaces")
-test_exact_search("1202 01  0001", "Double space")
-test_exact_search("1202010001", "No spaces")
-
-# Maybe it needs leading zeros or different grouping?
-test_exact_search("12020 10 001", "Different grouping 5-2-3")
-test_exact_search("120201 0001", "Different grouping 6-4")
\ No newline at end of file
+run_cases([
+    ("1202 01 0001", "Single spaces"),
+    ("1202 01  0001", "Double space"),
+    ("1202010001", "No spaces"),
+    # Maybe it needs leading zeros or different grouping?
+    ("12020 10 001", "Different grouping 5-2-3"),
+    ("120201 0001", "Different grouping 6-4"),
+])
\ No newline at end of file
@@ -1,30 +1,19 @@
 #!/usr/bin/env python3
 """Test map number search directly"""
 
-import requests
-from icare_address_search import search_fairfax_map_number, MAP_NUMBER_SEARCH_URL, collect_form_fields
+from icare_address_search import DEFAULT_SESSION, find_no_result_message, search_fairfax_map_number, MAP_NUMBER_SEARCH_URL, get_form_fields, post_search
 from bs4 import BeautifulSoup
 
+
 def test_map_search_debug(map_number):
     """Test with detailed debugging"""
-    session = requests.Session()
+    session = DEFAULT_SESSION
 
     print(f"\nTesting map number: {map_number}")
     print(f"URL: {MAP_NUMBER_SEARCH_URL}")
 
-    # Get initial page
-    initial = session.get(MAP_NUMBER_SEARCH_URL, timeout=30)
-    initial.raise_for_status()
-    print(f"Initial page status: {initial.status_code}")
-
-    # Parse the form to see what fields exist
-    soup = BeautifulSoup(initial.text, "html.parser")
-    input_field = soup.find("input", {"name": "inpParid"})
-    if input_field:
-        print(f"Found inpParid field with value: '{input_field.get('value', '')}'")
-
-    # Collect form fields
-    payload = collect_form_fields(initial.text)
+    # Collect form fields (the landing page is only fetched if no recent run cached them)
+    payload = get_form_fields(session, MAP_NUMBER_SEARCH_URL)
     print(f"\nForm fields collected: {len(payload)} fields")
 
     # Check specific fields
@@ -45,21 +34,18 @@ def test_map_search_debug(map_number):
 
     print(f"\nFormatted map number: '{map_formatted}'")
 
-    # Update payload
-    payload.update({
+    print("\nSending POST request...")
+    response = post_search(session, MAP_NUMBER_SEARCH_URL, {
         "inpParid": map_formatted,
         "hdAction": "Search",
         "PageNum": "1",
         "PageSize": "15",
         "selPageSize": "15",
     })
-
-    print("\nSending POST request...")
-    response = session.post(MAP_NUMBER_SEARCH_URL, data=payload, timeout=30)
     print(f"Response status: {response.status_code}")
 
     # Check if we got results
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = BeautifulSoup(response.text, "lxml")
 
     # Look for the results table
     table = soup.select_one("table.SearchResults")
@@ -74,10 +60,10 @@ def test_map_search_debug(map_number):
     if error_div:
         print(f"Error message: {error_div.get_text(strip=True)}")
 
-    # Check for no results message
-    no_results = soup.find(text=lambda t: "No results found" in t if t else False)
-    if no_results:
-        print("Found 'No results found' message")
+    # Check for no results / not found messages with one scan of the raw page
+    error_message = find_no_result_message(response.content)
+    if error_message:
+        print("Error indicator:", error_message)
 
     # Save the response for manual inspection
     with open("debug_response.html", "w") as f:
@@ -3,135 +3,380 @@
 Travis County, TX property search functions.
 """
 
+import logging
+import threading
+
 import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
 from typing import List, Dict, Tuple, Optional
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+from lxml.html import soupparser
 from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape
 import re
 
+logger = logging.getLogger(__name__)
+
 # Travis County search URL
 TRAVIS_SEARCH_URL = "https://travis.go2gov.net/cart/responsive/quickSearch.do"
 TRAVIS_PROPERTY_BASE = "https://travis.go2gov.net/cart/responsive/"
 
+# Request headers, built once. The browser headers are also the default
+# session's defaults; the search POST sends the full set so caller-supplied
+# sessions get them too.
+_BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    # Every encoding urllib3 can decode here (gzip/deflate, plus br/zstd when available)
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+}
+_SEARCH_HEADERS = {
+    **_BROWSER_HEADERS,
+    'Content-Type': 'application/x-www-form-urlencoded',
+    'Origin': 'https://travis.go2gov.net',
+    'Referer': 'https://travis.go2gov.net/cart/responsive/quickSearch.do'
+}
+
+# Patterns used on every parse, compiled once
+_PROP_ID_RE = re.compile(r"\d{14}")  # 14-digit property ID
+_OWNER_RE = re.compile(r"owner", re.I)
+_ADDRESS_RE = re.compile(r"\d+.*(?:st|rd|ave|dr|ln|way|ct)", re.I)
+# Property ID, owner and address, in the order _first_matching_texts returns them
+_FIELD_PATTERNS = (_PROP_ID_RE, _OWNER_RE, _ADDRESS_RE)
+
+# Flat propertyInfo blocks are read straight off the raw markup, in the same
+# order of preference as the tree lookups; nested blocks go through the tree
+_PROPERTY_INFO_RES = (
+    re.compile(r'<div[^>]+id="propertyInfo"[^>]*>(.*?)</div>', re.S | re.I),
+    re.compile(r'<div[^>]+class="property-info"[^>]*>(.*?)</div>', re.S | re.I),
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# Separators dropped from property IDs, removed in one translate() pass
+_ID_STRIP = str.maketrans("", "", " -_\t")
+
+# Search pages beyond this many (decoded) bytes are truncated before parsing;
+# real result pages are a small fraction of it
+_MAX_SEARCH_BODY = 512 * 1024
+
+# Lower-cased "No properties found" message, checked on the raw page
+_NO_RESULTS_MARKER = "no properties found"
+_NO_RESULTS_MARKER_BYTES = b"no properties found"
+
+# Compiled XPaths for the result and detail page lookups
+_XPATH_NS = {"re": "http://exslt.org/regular-expressions"}
+_HAS_CLASS = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+_RESULT_CANDIDATES_XPATH = etree.XPath(
+    "//*[self::div or self::tr][re:test(@class, 'result', 'i')]", namespaces=_XPATH_NS
+)
+_RESULT_TABLE_XPATHS = (
+    etree.XPath("(//table[re:test(@class, 'result', 'i')])[1]", namespaces=_XPATH_NS),
+    etree.XPath("(//table[re:test(@id, 'result', 'i')])[1]", namespaces=_XPATH_NS),
+)
+_PROPERTY_SECTION_XPATHS = (
+    etree.XPath("(//div[@id='propertyInfo'])[1]"),
+    etree.XPath(f"(//div[{_HAS_CLASS.format('property-info')}])[1]"),
+)
+_ROWS_XPATH = etree.XPath(".//tr")
+_DETAIL_LINK_XPATH = etree.XPath("(.//a[@href])[1]")
+_TEXT_NODES_XPATH = etree.XPath(".//text()")
+_VISIBLE_TEXT_XPATH = etree.XPath(".//text()[not(ancestor::script or ancestor::style)]")
+# Detail page label/value lookups
+_DETAIL_SECTIONS_XPATH = etree.XPath(
+    "//*[self::div or self::section or self::table][re:test(@class, 'detail|property|info', 'i')]",
+    namespaces=_XPATH_NS,
+)
+_DETAIL_ROWS_XPATH = etree.XPath(".//*[self::tr or self::div or self::dl]")
+_DETAIL_LABEL_XPATH = etree.XPath("(.//*[self::th or self::dt or self::span or self::label])[1]")
+_DETAIL_VALUE_XPATH = etree.XPath("(.//*[self::td or self::dd or self::span])[1]")
+
+
+def _create_session() -> requests.Session:
+    """Build the pooled keep-alive session used when callers don't pass one."""
+    session = requests.Session()
+    session.headers.update(_BROWSER_HEADERS)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared by every call that doesn't supply its own session, so repeat lookups
+# reuse the TLS connection to travis.go2gov.net
+_DEFAULT_SESSION = _create_session()
+
+
+# Parsed search results by (normalized property ID, page size), shared across sessions.
+# Only the structured results of searches that found something are kept, never
+# the raw page, and only for an hour so county updates show up.
+SEARCH_CACHE_TTL = 3600
+_SEARCH_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=SEARCH_CACHE_TTL)
+_SEARCH_CACHE_LOCK = threading.Lock()
+
+
+def _clear_search_cache() -> None:
+    """Drop every memoized search result."""
+    with _SEARCH_CACHE_LOCK:
+        _SEARCH_CACHE.clear()
+
+
+def _response_encoding(response: requests.Response) -> str:
+    """Return the charset the server declared, defaulting to UTF-8 (never runs chardet)."""
+    if "charset=" in response.headers.get("Content-Type", "").lower() and response.encoding:
+        return response.encoding
+    return "utf-8"
+
+
+# Container kinds in order of preference, tested against (tag name, class tokens).
+# Every kind has "result" in its class, so one pass over the div/tr elements
+# with a /result/i class finds candidates for all of them.
+_CONTAINER_PRIORITY = (
+    lambda tag, classes: tag == "div" and "property-result" in classes,
+    lambda tag, classes: tag == "tr" and "result-row" in classes,
+    lambda tag, classes: tag == "div" and "search-result" in classes,
+    lambda tag, classes: tag == "div" and classes == ["row", "result"],
+    lambda tag, classes: tag == "div",
+)
+
+
+def _select_result_containers(candidates: List[Tuple[object, str, List[str]]]) -> list:
+    """Return the elements of the most preferred container kind present in candidates."""
+    for matches in _CONTAINER_PRIORITY:
+        selected = [element for element, tag, classes in candidates if matches(tag, classes)]
+        if selected:
+            return selected
+    return []
+
+
+def _read_capped(response: requests.Response, limit: int) -> bytes:
+    """Read at most limit bytes of a streamed response's decoded body.
+
+    Goes through iter_content so truncated bodies, read timeouts and decode
+    errors surface as requests exceptions, like they do for response.content.
+    """
+    body = bytearray()
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        body += chunk
+        if len(body) >= limit:
+            break
+    return bytes(body[:limit])
+
+
+def _parse_html_tree(html: str | bytes, encoding: Optional[str] = None):
+    """Parse a page into an lxml tree, via BeautifulSoup if lxml's parser gives up.
+
+    Either way the result is an lxml element, so one set of XPath extractors
+    serves both paths.
+    """
+    # A fresh parser per call: lxml parser objects aren't thread-safe.
+    # collect_ids=False skips building the id index; nothing looks ids up
+    # through it (the XPaths test @id directly)
+    parser = lxml_html.HTMLParser(encoding=encoding, collect_ids=False)
+    try:
+        return lxml_html.fromstring(html, parser=parser)
+    except (etree.ParserError, ValueError):
+        # BeautifulSoup's builder is more forgiving (e.g. of empty documents)
+        if isinstance(html, bytes):
+            html = html.decode(encoding or "utf-8", "replace")
+        return soupparser.fromstring(html)
+
+
 def search_travis_property(
     property_id: str,
     session: requests.Session | None = None,
-) -> Tuple[List[Dict[str, str]], str]:
+    page_size: int = 1,
+    raise_errors: bool = False,
+) -> Tuple[List[Dict[str, str]], bytes]:
     """Search for a property in Travis County by property ID.
 
     Args:
         property_id: The property ID to search for (e.g., "01507011040000")
         session: Optional requests session to use
+        page_size: Rows requested from the server; a full property ID matches
+            exactly one, so raise this only for partial-ID searches
+        raise_errors: Re-raise request failures instead of returning no results,
+            so callers can tell "not found" from "couldn't ask"
 
     Returns:
-        Tuple of (list of property results, raw HTML response)
+        Tuple of (list of property results, raw HTML response). Repeat lookups
+        of the same ID and page size that found something are answered from
+        memory for an hour, with an empty raw response; clear them with
+        search_travis_property.cache_clear().
     """
-    session = session or requests.Session()
+    session = session or _DEFAULT_SESSION
 
     # Clean the property ID (remove any spaces or special characters)
-    property_id = property_id.strip().replace(" ", "").replace("-", "")
+    property_id = property_id.strip().translate(_ID_STRIP)
+
+    with _SEARCH_CACHE_LOCK:
+        cached = _SEARCH_CACHE.get((property_id, page_size))
+    if cached is not None:
+        logger.debug("Using cached Travis County results for '%s'", property_id)
+        return [dict(result) for result in cached], b""
 
-    print(f"[DEBUG] Searching Travis County for property ID: '{property_id}'")
+    logger.debug("Searching Travis County for property ID: '%s'", property_id)
 
     # Prepare the form data based on the curl request
     data = {
         'formViewMode': 'responsive',
         'criteria.searchStatus': '1',
-        'pager.pageSize': '10',
+        'pager.pageSize': str(page_size),
         'pager.pageNumber': '1',
         'criteria.heuristicSearch': property_id
     }
 
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Content-Type': 'application/x-www-form-urlencoded',
-        'Origin': 'https://travis.go2gov.net',
-        'Referer': 'https://travis.go2gov.net/cart/responsive/quickSearch.do'
-    }
-
     try:
-        # Send the search request
-        response = session.post(TRAVIS_SEARCH_URL, data=data, headers=headers, timeout=30)
-        response.raise_for_status()
+        # Send the search request, streaming so an oversized page is cut off
+        # at _MAX_SEARCH_BODY instead of being buffered whole
+        with session.post(
+            TRAVIS_SEARCH_URL, data=data, headers=_SEARCH_HEADERS, timeout=30, stream=True
+        ) as response:
+            response.raise_for_status()
+            body = _read_capped(response, _MAX_SEARCH_BODY)
+
+        # Parse the raw bytes; response.text would run charset detection first
+        results = parse_travis_results(body, encoding=_response_encoding(response))
+        logger.debug("Found %d results", len(results))
+
+        # Misses aren't cached, so a property that appears later is found
+        if results:
+            with _SEARCH_CACHE_LOCK:
+                _SEARCH_CACHE[(property_id, page_size)] = tuple(dict(result) for result in results)
+        return results, body
 
-        # Parse the results
-        results = parse_travis_results(response.text)
-        print(f"[DEBUG] Found {len(results)} results")
+    except requests.RequestException as e:
+        if raise_errors:
+            raise
+        logger.error("Failed to search Travis County: %s", e)
+        return [], b""
 
-        return results, response.text
 
-    except requests.RequestException as e:
-        print(f"[ERROR] Failed to search Travis County: {e}")
-        return [], ""
+search_travis_property.cache_clear = _clear_search_cache
 
 
-def parse_travis_results(html: str) -> List[Dict[str, str]]:
+def parse_travis_results(html: str | bytes, encoding: Optional[str] = None) -> List[Dict[str, str]]:
     """Parse the Travis County search results HTML.
 
     Args:
-        html: The HTML response from the search
+        html: The HTML response from the search, as text or raw bytes
+        encoding: Charset of raw bytes, if known (otherwise taken from the markup)
 
     Returns:
         List of dictionaries containing property information
     """
-    soup = BeautifulSoup(html, "html.parser")
-    results = []
+    # First, check if there are any results. lower() + substring test is far
+    # cheaper than a case-insensitive regex (and no tree is needed)
+    marker = _NO_RESULTS_MARKER_BYTES if isinstance(html, bytes) else _NO_RESULTS_MARKER
+    if marker in html.lower():
+        logger.debug("No properties found message detected")
+        return []
 
-    # Look for the results table or list
-    # Travis County uses a different format - need to inspect the actual HTML
+    if isinstance(html, str):
+        encoding = None
 
-    # First, check if there are any results
-    no_results = soup.find(text=re.compile(r"No properties found", re.IGNORECASE))
-    if no_results:
-        print("[DEBUG] No properties found message detected")
-        return []
+    return _parse_results_tree(html, encoding)
 
-    # Try to find property results - Travis County may use different selectors
-    # Look for common patterns in property search results
 
-    # Try finding by class names that might contain results
-    result_containers = (
-        soup.find_all("div", class_="property-result") or
-        soup.find_all("tr", class_="result-row") or
-        soup.find_all("div", class_="search-result") or
-        soup.find_all("div", class_="row result") or
-        soup.find_all("div", {"class": re.compile(r"result", re.I)})
-    )
+def _first_matching_texts(texts, patterns: Tuple[re.Pattern, ...]) -> list:
+    """Return, for each pattern, the first of texts it matches (like soup.find(text=...)).
+
+    All patterns are checked in a single pass, stopping once each has a match.
+    """
+    found = [None] * len(patterns)
+    remaining = len(patterns)
+    for text in texts:
+        for i, pattern in enumerate(patterns):
+            if found[i] is None and pattern.search(text):
+                found[i] = text
+                remaining -= 1
+        if not remaining:
+            break
+    return found
+
+
+def _parse_property_text(text_content: str) -> Dict[str, str]:
+    """Pick the property ID, owner and address lines out of a propertyInfo block's text."""
+    property_data = {}
+    lines = [line.strip() for line in text_content.split('\n') if line.strip()]
+
+    for line in lines:
+        if _PROP_ID_RE.match(line):
+            property_data["Property ID"] = line
+        elif "owner" in line.lower():
+            property_data["Owner"] = line.split(":", 1)[-1].strip()
+        elif _ADDRESS_RE.search(line):
+            property_data["Address"] = line
+
+    return property_data
+
+
+def _property_info_from_markup(html: str | bytes, encoding: Optional[str] = None) -> Optional[Dict[str, str]]:
+    """Parse a flat propertyInfo block with regexes over the raw markup.
+
+    Returns None when no block matches or the block nests further divs or
+    scripts, so the caller falls back to the parsed tree.
+    """
+    if isinstance(html, bytes):
+        html = html.decode(encoding or "utf-8", "replace")
+    for pattern in _PROPERTY_INFO_RES:
+        match = pattern.search(html)
+        if match:
+            block = match.group(1)
+            lowered = block.lower()
+            if "<div" in lowered or "<script" in lowered or "<style" in lowered:
+                return None
+            return _parse_property_text(unescape(_TAG_RE.sub("", block)))
+    return None
+
+
+def _parse_results_tree(html: str | bytes, encoding: Optional[str] = None) -> List[Dict[str, str]]:
+    """Extract property results with compiled XPaths over the parsed page."""
+    root = _parse_html_tree(html, encoding)
+    results = []
+
+    result_containers = _select_result_containers([
+        (element, element.tag, (element.get("class") or "").split())
+        for element in _RESULT_CANDIDATES_XPATH(root)
+    ])
 
     # Also check for table-based results
     if not result_containers:
-        table = soup.find("table", {"class": re.compile(r"result", re.I)}) or \
-                soup.find("table", {"id": re.compile(r"result", re.I)})
-        if table:
-            result_containers = table.find_all("tr")[1:]  # Skip header row
+        for xpath in _RESULT_TABLE_XPATHS:
+            tables = xpath(root)
+            if tables:
+                result_containers = _ROWS_XPATH(tables[0])[1:]  # Skip header row
+                break
 
-    # Parse each result
     for container in result_containers:
         property_data = {}
 
-        # Try to extract common fields
-        # Property ID
-        prop_id = container.find(text=re.compile(r"\d{14}"))  # 14-digit property ID
+        prop_id, owner_elem, address_elem = _first_matching_texts(
+            _TEXT_NODES_XPATH(container), _FIELD_PATTERNS
+        )
         if prop_id:
             property_data["Property ID"] = prop_id.strip()
 
-        # Owner name
-        owner_elem = container.find(text=re.compile(r"owner", re.I))
-        if owner_elem and owner_elem.parent:
-            owner_text = owner_elem.parent.get_text(strip=True)
-            property_data["Owner"] = owner_text.replace("Owner:", "").strip()
+        if owner_elem is not None:
+            # A tail string belongs to the element enclosing its lxml "parent"
+            parent = owner_elem.getparent()
+            if owner_elem.is_tail:
+                parent = parent.getparent()
+            if parent is not None:
+                owner_text = "".join(t.strip() for t in _VISIBLE_TEXT_XPATH(parent))
+                property_data["Owner"] = owner_text.replace("Owner:", "").strip()
 
-        # Address
-        address_elem = container.find(text=re.compile(r"\d+.*(?:st|rd|ave|dr|ln|way|ct)", re.I))
         if address_elem:
             property_data["Address"] = address_elem.strip()
 
-        # Try to find a link to property details
-        detail_link = container.find("a", href=True)
-        if detail_link:
-            href = detail_link.get("href", "")
+        detail_links = _DETAIL_LINK_XPATH(container)
+        if detail_links:
+            href = detail_links[0].get("href", "")
             if href:
                 property_data["DetailURL"] = urljoin(TRAVIS_PROPERTY_BASE, href)
 
@@ -140,27 +385,20 @@ def parse_travis_results(html: str) -> List[Dict[str, str]]:
 
     # If no structured results found, try to extract from the page text
     if not results:
-        # Look for property information in a more generic way
-        property_section = soup.find("div", {"id": "propertyInfo"}) or \
-                          soup.find("div", {"class": "property-info"})
-
-        if property_section:
-            property_data = {}
+        property_data = _property_info_from_markup(html, encoding)
+        if property_data is None:
+            property_section = None
+            for xpath in _PROPERTY_SECTION_XPATHS:
+                sections = xpath(root)
+                if sections:
+                    property_section = sections[0]
+                    break
+
+            if property_section is not None:
+                property_data = _parse_property_text("".join(_VISIBLE_TEXT_XPATH(property_section)))
 
-            # Extract text content and parse it
-            text_content = property_section.get_text()
-            lines = [line.strip() for line in text_content.split('\n') if line.strip()]
-
-            for line in lines:
-                if re.match(r"\d{14}", line):
-                    property_data["Property ID"] = line
-                elif "owner" in line.lower():
-                    property_data["Owner"] = line.split(":", 1)[-1].strip()
-                elif re.search(r"\d+.*(?:st|rd|ave|dr|ln|way|ct)", line, re.I):
-                    property_data["Address"] = line
-
-            if property_data:
-                results.append(property_data)
+        if property_data:
+            results.append(property_data)
 
     return results
 
@@ -178,45 +416,64 @@ def fetch_travis_property_details(
     Returns:
         Dictionary containing property details
     """
-    session = session or requests.Session()
+    session = session or _DEFAULT_SESSION
 
     try:
         response = session.get(detail_url, timeout=30)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        details = {}
+        return _parse_details_tree(response.content, _response_encoding(response))
 
-        # Extract property details from the page
-        # This will need to be customized based on Travis County's actual HTML structure
+    except requests.RequestException as e:
+        logger.error("Failed to fetch property details: %s", e)
+        return {}
 
-        # Look for common property detail patterns
-        detail_sections = soup.find_all(["div", "section", "table"],
-                                       {"class": re.compile(r"detail|property|info", re.I)})
 
-        for section in detail_sections:
-            # Extract key-value pairs
-            rows = section.find_all(["tr", "div", "dl"])
-            for row in rows:
-                # Try to find label-value pairs
-                label = row.find(["th", "dt", "span", "label"])
-                value = row.find(["td", "dd", "span"])
+def _parse_details_tree(html: bytes, encoding: Optional[str] = None) -> Dict[str, object]:
+    """Extract detail label/value pairs with compiled XPaths over the parsed page."""
+    root = _parse_html_tree(html, encoding)
+    details = {}
 
-                if label and value:
-                    key = label.get_text(strip=True).rstrip(":")
-                    val = value.get_text(strip=True)
-                    if key and val:
-                        details[key] = val
+    for section in _DETAIL_SECTIONS_XPATH(root):
+        for row in _DETAIL_ROWS_XPATH(section):
+            labels = _DETAIL_LABEL_XPATH(row)
+            values = _DETAIL_VALUE_XPATH(row)
+            if labels and values:
+                key = "".join(t.strip() for t in _VISIBLE_TEXT_XPATH(labels[0])).rstrip(":")
+                val = "".join(t.strip() for t in _VISIBLE_TEXT_XPATH(values[0]))
+                if key and val:
+                    details[key] = val
 
-        return details
+    return details
 
-    except requests.RequestException as e:
-        print(f"[ERROR] Failed to fetch property details: {e}")
-        return {}
+
+def fetch_travis_property_details_bulk(
+    detail_urls: List[str],
+    session: requests.Session | None = None,
+    max_workers: int = 8,
+) -> List[Dict[str, object]]:
+    """Fetch details for several properties concurrently.
+
+    Args:
+        detail_urls: URLs to property detail pages
+        session: Optional requests session (its pool should allow max_workers connections)
+        max_workers: Maximum number of pages fetched at once
+
+    Returns:
+        List of detail dictionaries in the same order as detail_urls
+    """
+    session = session or _DEFAULT_SESSION
+    if not detail_urls:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(detail_urls))) as executor:
+        return list(executor.map(lambda url: fetch_travis_property_details(url, session), detail_urls))
 
 
 # Test function
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="[%(levelname)s] %(message)s")
+
     # Test with the provided property ID
     test_id = "01507011040000"
     print(f"Testing Travis County search with property ID: {test_id}")
@@ -233,6 +490,6 @@ if __name__ == "__main__":
         print("\nNo results found")
 
         # Save HTML for debugging
-        with open("travis_search_debug.html", "w") as f:
+        with open("travis_search_debug.html", "wb") as f:
             f.write(html)
         print("HTML saved to travis_search_debug.html for debugging")
\ No newline at end of file